@@ -3,31 +3,58 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from builtins import range
 from builtins import object
 import time
 import logging
 from collections import OrderedDict
 
+import numpy as np
+
 from floor import processor
 from floor.processor.base import RenderContext
 from floor.controller.rendering import PlaylistRenderLayer
 from floor.controller.rendering import ProcessorRenderLayer
 from floor.controller.playlist import PlaylistManager
-from floor.util.color_utils import alpha_blend
-from floor.util.color_utils import normalize_pixel
-from floor.util.color_utils import set_brightness
+from floor.processor.constants import COLOR_MAXIMUM
+from floor.util import color_utils_nb
 from floor.util.simple_profile import profile
 
 
 logger = logging.getLogger('controller')
 
 
+class MonotonicClock(object):
+    """A clocksource like the `time` module, except that `.time()` is `time.monotonic()`.
+
+    Unlike wall clock time, it never jumps (e.g. on NTP adjustments), which would
+    otherwise cause negative frame times or very long sleeps.
+    """
+    @staticmethod
+    def time():
+        return time.monotonic()
+
+    @staticmethod
+    def sleep(seconds):
+        time.sleep(seconds)
+
+
+MONOTONIC = MonotonicClock()
+
+
 class Controller(object):
     DEFAULT_FPS = 120
     DEFAULT_BPM = 120.0
 
-    def __init__(self, drivers, playlist_manager, clocksource=time):
+    # `delay()` sleeps in chunks of this size, then spins for the remainder.
+    SLEEP_CHUNK_SECONDS = 0.001
+    # Extra headroom kept when deciding whether another sleep chunk fits.
+    SLEEP_MARGIN_SECONDS = 0.0005
+    # Weight given to each new measurement in the `sleep_estimate` average.
+    SLEEP_ESTIMATE_WEIGHT = 0.1
+    # A frame taking longer than this many frame periods skips the next frame.
+    LATE_FRAME_FACTOR = 1.5
+
+    def __init__(self, drivers, playlist_manager, clocksource=MONOTONIC):
         """Constructor.
         
         Arguments:
@@ -36,17 +63,25 @@ class Controller(object):
         
         Keyword Arguments:
             clocksource {function} -- An object that should have `.time()`
-            and `.sleep()` methods (default: {time})
+            and `.sleep()` methods; `.time()` must advance on its own, since
+            `delay()` busy-waits on it (default: {MONOTONIC})
         """
         assert len(drivers) > 0, 'Must provide 1 or more drivers'
         self.drivers = drivers
         assert isinstance(playlist_manager, PlaylistManager), 'playlist_manager is not a PlaylistManager'
         self.playlist_manager = playlist_manager
         self.clocksource = clocksource
+        # Playlists compare their deadlines against frame timestamps.
+        self.playlist_manager.set_clock(clocksource.time)
         self.frame_start = 0
         self.fps = None
         self.frame_seconds = None
 
+        # Running estimate of how long a `SLEEP_CHUNK_SECONDS` sleep really takes.
+        self.sleep_estimate = 2 * self.SLEEP_CHUNK_SECONDS
+        # Set when a frame ran so late that the next one should be skipped.
+        self.skip_next_frame = False
+
         self.all_processors = processor.all_processors()
 
         self.set_fps(self.DEFAULT_FPS)
@@ -62,12 +97,16 @@ class Controller(object):
         self.downbeat = None
         self.set_bpm(self.DEFAULT_BPM)
 
-        # Give outside controllers a chance to fake foot steps on the floor
-        self.synthetic_weights = [0] * 64
+        # Give outside controllers a chance to fake foot steps on the floor.
+        self.synthetic_weights = np.zeros(64, dtype=np.int32)
 
         # A global "brightness" level, a value between 0.0 and 1.0.
         self.brightness = 1.0
 
+        # Composited output of all layers, reused across frames. Pixels are
+        # normalized integers, so 16 bits per channel is enough.
+        self.frame_buffer = np.zeros((64, 3), dtype=np.uint16)
+
     def _iter_enabled_layers(self):
         """Returns an iterable of all enabled layers."""
         return [layer for layer in list(self.layers.values()) if layer.is_enabled()]
@@ -91,7 +130,7 @@ class Controller(object):
         logger.info('Set brightness to: {}%'.format(int(self.brightness * 100)))
 
     def handle_input_event(self, event_name, num, value):
-        logger.debug('input event: {}: {} -> {}'.format(event_name, num, value))
+        logger.debug('input event: %s: %s -> %s', event_name, num, value)
         if event_name == 'playlist_ranged_value':
             self.layers['playlist'].on_ranged_value_change(num, value)
         elif event_name == 'overlay1_ranged_value':
@@ -105,28 +144,44 @@ class Controller(object):
         elif event_name == 'overlay2_switch':
             self.layers['overlay2'].on_switch_change(num, value)
         else:
-            logger.warning('Ignoring unknown event {}'.format(event_name))
+            logger.warning('Ignoring unknown event %s', event_name)
 
     def square_weight_on(self, index):
         if index > 64 or index < 1:
-            logger.error("Ignoring square_weight_on() value beyond bounds")
+            logger.error('Ignoring square_weight_on() index %d beyond bounds', index)
             return
         self.synthetic_weights[index-1] = 1
 
     def square_weight_off(self, index):
         if index > 64 or index < 1:
-            logger.error("Ignoring square_weight_on() value beyond bounds")
+            logger.error('Ignoring square_weight_off() index %d beyond bounds', index)
             return
         self.synthetic_weights[index-1] = 0
 
+    def warm_up(self):
+        """Compiles jitted kernels now, so the first frames (or the first
+        time a processor plays) aren't stalled by compilation."""
+        color_utils_nb.warm_up()
+        for processor_cls in self.all_processors.values():
+            processor_cls.warm_up()
+        for driver in self.drivers:
+            driver.warm_up()
+
     def run_forever(self):
+        self.warm_up()
         while True:
             self.run_one_frame()
 
     @profile(print_seconds=2)
     def run_one_frame(self):
         self.init_loop()
-        self.generate_frame()
+        if self.skip_next_frame:
+            # Rather than fall further behind, hold the last frame for one
+            # more period to catch up.
+            self.skip_next_frame = False
+            logger.debug('Behind schedule, skipping frame')
+        else:
+            self.generate_frame()
         self.transfer_data()
         self.delay()
 
@@ -137,7 +192,8 @@ class Controller(object):
     @profile()
     def generate_frame(self):
         weights = self.get_weights()
-        composited_leds = [(0, 0, 0)] * 64
+        composited_leds = self.frame_buffer
+        composited_leds.fill(0)
         for layer in self._iter_enabled_layers():
             context = RenderContext(
                 clock=self.frame_start,
@@ -146,30 +202,31 @@ class Controller(object):
                 bpm=self.bpm,
                 ranged_values=layer.ranged_values,
                 switches=layer.switches,
+                out_buffer=layer.out_buffer,
             )
             current_leds = layer.render(context)
-            if not current_leds:
+            if current_leds is None or len(current_leds) == 0:
                 continue
-            for idx, current_pixel in enumerate(current_leds):
-                current_pixel = normalize_pixel(current_pixel)
-                last_pixel = composited_leds[idx]
-                composited_leds[idx] = alpha_blend(current_pixel, last_pixel, layer.get_alpha())
+            current_leds = np.asarray(current_leds, dtype=np.float32)
+            alpha256 = color_utils_nb.alpha_to_fixed(layer.get_alpha())
+            color_utils_nb.blend_norm_u16(current_leds, composited_leds, alpha256,
+                                          COLOR_MAXIMUM, composited_leds)
 
-        leds = [set_brightness(pixel, self.brightness) for pixel in composited_leds]
+        leds = composited_leds
+        if self.brightness != 1.0:
+            leds = leds * self.brightness
         for driver in self.drivers:
             driver.set_leds(leds)
 
     @profile()
     def get_weights(self):
         # Returns a single frame of weights, by taking the `max()` of
-        # every driver's reported weight for every pixel.
-        all_weights = [driver.get_weights() for driver in self.drivers]
-        all_weights.append(self.synthetic_weights)
-
-        weights = [0] * 64
-        for i in range(len(weights)):
-            max_weight = max(w[i] if len(w) > i else 0 for w in all_weights)
-            weights[i] = max_weight
+        # every driver's reported weight and the synthetic weight for every pixel.
+        weights = self.synthetic_weights.copy()
+        for driver in self.drivers:
+            driver_weights = np.asarray(driver.get_weights(), dtype=np.int32)[:64]
+            count = len(driver_weights)
+            np.maximum(weights[:count], driver_weights, out=weights[:count])
         return weights
 
     @profile()
@@ -180,9 +237,28 @@ class Controller(object):
 
     @profile()
     def delay(self):
-        elapsed = self.clocksource.time() - self.frame_start
+        """Wait out the rest of the current frame.
 
-        if elapsed < self.frame_seconds:
-            self.clocksource.sleep(self.frame_seconds - elapsed)
-        else:
-            logger.debug("Over by {}".format(elapsed - self.frame_seconds))
+        A single `sleep()` for the remaining time can overshoot by the OS
+        scheduler's resolution, which drops frames at high frame rates. Instead,
+        sleep in short chunks while the remaining time comfortably exceeds how
+        long a chunk has been taking, then spin until the deadline. This is the
+        approach used by FNA's frame limiter.
+        """
+        deadline = self.frame_start + self.frame_seconds
+        now = self.clocksource.time()
+
+        if now >= deadline:
+            logger.debug('Over by %s', now - deadline)
+            elapsed = now - self.frame_start
+            self.skip_next_frame = elapsed > self.frame_seconds * self.LATE_FRAME_FACTOR
+            return
+
+        while deadline - now > self.sleep_estimate + self.SLEEP_MARGIN_SECONDS:
+            self.clocksource.sleep(self.SLEEP_CHUNK_SECONDS)
+            slept_until = self.clocksource.time()
+            self.sleep_estimate += (slept_until - now - self.sleep_estimate) * self.SLEEP_ESTIMATE_WEIGHT
+            now = slept_until
+
+        while now < deadline:
+            now = self.clocksource.time()
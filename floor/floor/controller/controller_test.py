@@ -6,7 +6,7 @@ from __future__ import unicode_literals
 import os
 from floor.processor import all_processors
 from floor.controller.controller import Controller
-from floor.controller.playlist import Playlist, PlaylistManager
+from floor.controller.playlist import Playlist, PlaylistItem, PlaylistManager
 from unittest import TestCase
 from mock import Mock
 from floor.processor.base import Base as BaseProcessor
@@ -32,6 +32,36 @@ class SingleColorProcessor(BaseProcessor):
         return [self.color] * 64
 
 
+class OutBufferProcessor(BaseProcessor):
+    """A test processor that fills `context.out_buffer` with a single color."""
+    def __init__(self, **kwargs):
+        self.color = kwargs.pop('color', BLACK)
+        self.buffers = []
+        super(OutBufferProcessor, self).__init__(**kwargs)
+
+    def get_next_frame(self, context):
+        self.buffers.append(context.out_buffer)
+        context.out_buffer[:] = self.color
+        return context.out_buffer
+
+
+class FakeClock(object):
+    """A controller clocksource where reading the time takes 10us and each
+    sleep overshoots by `oversleep` seconds."""
+    def __init__(self, now=1000.0, oversleep=0.0):
+        self.now = now
+        self.oversleep = oversleep
+        self.sleeps = 0
+
+    def time(self):
+        self.now += 0.00001
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps += 1
+        self.now += seconds + self.oversleep
+
+
 class ControllerTest(TestCase):
     @staticmethod
     def new_fake_driver():
@@ -53,6 +83,10 @@ class ControllerTest(TestCase):
         self.assertEqual(120, c.bpm)
         self.assertEqual(120, c.fps)
 
+    def test_warm_up(self):
+        self.controller.warm_up()
+        self.driver.warm_up.assert_called_once_with()
+
     def test_rendering(self):
         c = self.controller
         c.run_one_frame()
@@ -74,19 +108,95 @@ class ControllerTest(TestCase):
         controller = Controller([driver], playlist_manager)
 
         controller.run_one_frame()
-        self.assertEqual([BLUE + (1.0,)] * 64, driver.set_leds.call_args[0][0])
+        self.assertEqual([list(BLUE)] * 64, driver.set_leds.call_args[0][0].tolist())
 
         overlay2 = controller.layers['overlay2']
         overlay2.set_processor(red_processor)
         overlay2.set_alpha(0.5)
         controller.run_one_frame()
-        self.assertEqual([(0x7f, 0x00, 0x7f)] * 64, driver.set_leds.call_args[0][0])
+        self.assertEqual([[0x7f, 0x00, 0x7f]] * 64, driver.set_leds.call_args[0][0].tolist())
 
         overlay1 = controller.layers['overlay1']
         overlay1.set_processor(green_processor)
         overlay1.set_alpha(0.5)
         controller.run_one_frame()
-        self.assertEqual([(0x3f, 0x7f, 0x3f)] * 64, driver.set_leds.call_args[0][0])
+        self.assertEqual([[0x3f, 0x7f, 0x3f]] * 64, driver.set_leds.call_args[0][0].tolist())
+
+    def test_processor_out_buffer(self):
+        playlist = Playlist.from_single_processor(OutBufferProcessor, args={'color': GREEN})
+        driver = self.new_fake_driver()
+        controller = Controller([driver], PlaylistManager(playlist))
+
+        controller.run_one_frame()
+        controller.run_one_frame()
+        self.assertEqual([list(GREEN)] * 64, driver.set_leds.call_args[0][0].tolist())
+
+        # The same buffer is handed back every frame.
+        buffers = controller.layers['playlist'].current_processor.buffers
+        self.assertEqual(2, len(buffers))
+        self.assertIs(buffers[0], buffers[1])
+
+    def test_late_frame_skips_next_frame(self):
+        clock = FakeClock()
+        processor = SingleColorProcessor(color=RED)
+        processor.get_next_frame = Mock(return_value=[RED] * 64)
+        controller = Controller([self.new_fake_driver()], self.playlist_manager, clocksource=clock)
+        controller.set_fps(10)
+        overlay1 = controller.layers['overlay1']
+        overlay1.set_processor(processor)
+
+        controller.run_one_frame()
+        self.assertEqual(1, processor.get_next_frame.call_count)
+
+        # A frame that runs twice as long as it should skips the next frame ...
+        def slow_frame(context):
+            clock.now += 0.2
+            return [RED] * 64
+        processor.get_next_frame.side_effect = slow_frame
+        controller.run_one_frame()
+        self.assertEqual(2, processor.get_next_frame.call_count)
+        controller.run_one_frame()
+        self.assertEqual(2, processor.get_next_frame.call_count)
+
+        # ... and then rendering resumes.
+        processor.get_next_frame.side_effect = None
+        controller.run_one_frame()
+        self.assertEqual(3, processor.get_next_frame.call_count)
+
+    def test_playlist_advances_on_injected_clock(self):
+        for start in (10.0, 1e9):
+            playlist = Playlist('Test', items=[
+                PlaylistItem(SingleColorProcessor, title='first', duration=10, processor_args={'color': RED}),
+                PlaylistItem(SingleColorProcessor, title='second', duration=10, processor_args={'color': BLUE}),
+            ])
+            controller = Controller(
+                [self.new_fake_driver()], PlaylistManager(playlist), clocksource=FakeClock(start))
+            controller.set_fps(10)
+            layer = controller.layers['playlist']
+
+            titles = []
+            for _ in range(150):
+                controller.run_one_frame()
+                titles.append(layer.current_playlist_item.title)
+
+            # Each 10s item lasts about 100 frames at 10 fps.
+            self.assertEqual(['first'] * 95, titles[:95], 'start={}'.format(start))
+            self.assertEqual(['second'] * 40, titles[-40:], 'start={}'.format(start))
+
+    def test_out_of_range_input_events_are_ignored(self):
+        c = self.controller
+        layer = c.layers['overlay1']
+        layer.processor = Mock()
+
+        c.handle_input_event('overlay1_ranged_value', 1, 64)
+        layer.processor.on_ranged_value_change.assert_called_once_with(1, 64)
+
+        for num in (4, -1):
+            c.handle_input_event('overlay1_ranged_value', num, 127)
+            c.handle_input_event('overlay1_switch', num, True)
+        self.assertEqual([0, 64, 0, 0], layer.ranged_values)
+        self.assertEqual([False] * 4, layer.switches)
+        layer.processor.on_ranged_value_change.assert_called_once_with(1, 64)
 
     def test_multiple_drivers_get_weights_are_blended(self):
         driver1 = Mock()
@@ -101,14 +211,34 @@ class ControllerTest(TestCase):
         weights = controller.get_weights()
 
         expected_weights = [0, 1] * 32
-        self.assertEqual(expected_weights, weights)
+        self.assertEqual(expected_weights, weights.tolist())
 
         controller.square_weight_on(1)
         expected_weights[0] = 1
         weights = controller.get_weights()
-        self.assertEqual(expected_weights, weights)
+        self.assertEqual(expected_weights, weights.tolist())
 
         controller.square_weight_off(1)
         expected_weights[0] = 0
         weights = controller.get_weights()
-        self.assertEqual(expected_weights, weights)
+        self.assertEqual(expected_weights, weights.tolist())
+        self.assertEqual('int32', weights.dtype.name)
+
+        # Synthetic weights are combined with `max()`, so they can't hide a real step.
+        controller.square_weight_off(2)
+        self.assertEqual(expected_weights, controller.get_weights().tolist())
+
+    def test_delay_sleeps_then_spins_until_deadline(self):
+        clock = FakeClock(oversleep=0.001)
+        controller = Controller([self.new_fake_driver()], self.playlist_manager, clocksource=clock)
+        controller.set_fps(24)
+        for _ in range(10):
+            controller.init_loop()
+            controller.delay()
+            deadline = controller.frame_start + controller.frame_seconds
+            self.assertGreaterEqual(clock.now, deadline)
+            self.assertLess(clock.now, deadline + 0.0001)
+
+        self.assertGreater(clock.sleeps, 0)
+        # The estimate should have learned that a 1ms sleep takes ~2ms.
+        self.assertAlmostEqual(0.002, controller.sleep_estimate, places=3)
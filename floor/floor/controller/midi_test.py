@@ -113,3 +113,19 @@ class MidiManagerTestCase(TestCase):
         self.assertEqual(0, self.controller.playlist_manager.stay.call_count)
         self.inject_note_on('Csn1', 127)
         self.assertEqual(1, self.controller.playlist_manager.stay.call_count)
+
+
+class MidiConstantsTestCase(TestCase):
+    def test_note_name(self):
+        self.assertEqual('C-1', note_name(0))
+        self.assertEqual('C#-1', note_name(1))
+        self.assertEqual('C4', note_name(60))
+        self.assertEqual('G9', note_name(127))
+
+    def test_midi_note_names(self):
+        self.assertEqual(128, len(MIDI_NOTE_NAMES))
+        self.assertEqual('C#-1', MIDI_NOTE_NAMES['Csn1'])
+        self.assertEqual('A#4', MIDI_NOTE_NAMES['As4'])
+        self.assertEqual('G9', MIDI_NOTE_NAMES['G9'])
+        with self.assertRaises(TypeError):
+            MIDI_NOTE_NAMES['G9'] = 'G10'
@@ -1,6 +1,6 @@
 from builtins import object
 import json
-from time import time
+from time import monotonic
 import logging
 from floor.processor.base import Base as ProcessorBase
 import os
@@ -22,13 +22,20 @@ class InvalidPlaylistFile(PlaylistError):
 
 
 class PlaylistItem:
-    """An immutable holder of a playlist entry."""
+    """A holder of a playlist entry.
+
+    `remaining_duration` is runtime state: the seconds left on this item when
+    its playlist was stopped. It is not saved with the playlist.
+    """
+    __slots__ = ('processor_cls', 'processor_args', 'duration', 'title', 'remaining_duration')
+
     def __init__(self, processor_cls, title=None, duration=None, processor_args=None):
         assert issubclass(processor_cls, ProcessorBase), '{} is not a subclass of processor.Base'.format(processor_cls)
         self.processor_cls = processor_cls
         self.processor_args = processor_args or {}
         self.duration = int(duration) if duration is not None else None
         self.title = title or self.processor_cls.__name__
+        self.remaining_duration = None
 
     @classmethod
     def from_object(cls, obj, all_processors):
@@ -51,8 +58,10 @@ class PlaylistItem:
 
 
 class Playlist(object):
-    def __init__(self, title, items=None):
+    def __init__(self, title, items=None, clock=monotonic):
         self.title = title
+        # Returns the current time in seconds; only differences are used.
+        self.clock = clock
         # The index into the queue array
         self.position = None
         # Time when the playlist should auto advance.
@@ -67,7 +76,7 @@ class Playlist(object):
     def from_file(cls, filename, all_processors, strict=False):
         try:
             with open(filename) as fd:
-                return cls.from_object(json.loads(fd.read()), all_processors, strict)
+                return cls.from_object(json.load(fd), all_processors, strict)
         except json.decoder.JSONDecodeError as e:
             raise InvalidPlaylistFile('File "{}" json is malformed: {}'.format(filename, e))
 
@@ -91,7 +100,7 @@ class Playlist(object):
                     logger.warning(e)
             else:
                 items.append(item)
-        return Playlist(title, items=items)
+        return cls(title, items=items)
 
     @classmethod
     def from_single_processor(cls, processor_cls, args=None):
@@ -113,7 +122,7 @@ class Playlist(object):
             'title': self.title,
         }
         with open(output_filename, 'w') as fp:
-            fp.write(json.dumps(playlist, indent=2))
+            json.dump(playlist, fp, indent=2)
             fp.write('\n')
 
     def is_running(self):
@@ -124,9 +133,9 @@ class Playlist(object):
 
         # Save time remaining
         if self.next_advance is not None:
-            current['remaining_duration'] = self.next_advance - time()
+            current.remaining_duration = self.next_advance - self.clock()
         else:
-            current['remaining_duration'] = None
+            current.remaining_duration = None
         self.next_advance = None
 
         self.running = False
@@ -134,9 +143,9 @@ class Playlist(object):
     def start_playlist(self):
         current = self.queue[self.position]
 
-        if current['remaining_duration'] is not None:
+        if current.remaining_duration is not None:
             # Restore time remaining
-            self.next_advance = time() + current['remaining_duration']
+            self.next_advance = self.clock() + current.remaining_duration
         else:
             self.next_advance = None
 
@@ -154,16 +163,22 @@ class Playlist(object):
         self.queue.insert(self.position, item)
         return position
 
-    def get_current(self):
-        """Get the current item, advancing if it's time to."""
+    def get_current(self, now=None):
+        """Get the current item, advancing if it's time to.
+
+        `now` is the current `self.clock()` value, if the caller already has it.
+        """
         if not self.queue:
             return None
 
         if self.position is None:
             # First call: Start the first item.
             self.advance()
-        elif self.next_advance is not None and (time() > self.next_advance):
-            self.advance()
+        elif self.next_advance is not None:
+            if now is None:
+                now = self.clock()
+            if now > self.next_advance:
+                self.advance()
 
         return self.queue[self.position]
 
@@ -195,7 +210,7 @@ class Playlist(object):
 
         current = self.queue[self.position]
         if current.duration:
-            self.next_advance = time() + current.duration
+            self.next_advance = self.clock() + current.duration
         else:
             self.next_advance = None
 
@@ -228,7 +243,7 @@ class Playlist(object):
 
 class PlaylistManager:
     PLAYLIST_NAME_DEFAULT = 'default'
-    PLAYLIST_NAME_RE = re.compile('[0-9a-zA-Z_\s]+')
+    PLAYLIST_NAME_RE = re.compile(r'[0-9a-zA-Z_\s]+')
 
     def __init__(self, default_playlist, user_playlists_dir=None):
         self.default_playlist = default_playlist
@@ -236,8 +251,20 @@ class PlaylistManager:
         # Map of slug-like names to playlist objects.
         self.user_playlists = {}
         self.current_playlist = self.default_playlist
+        # Clock shared by every managed playlist; None leaves each playlist's own.
+        self.clock = None
         self.logger = logging.getLogger('PlaylistManager')
 
+    def set_clock(self, clock):
+        """Sets the clock used by every playlist, current and future.
+
+        The controller calls this with its clocksource, so that playlist
+        timing and frame timestamps come from the same clock.
+        """
+        self.clock = clock
+        for playlist in self.get_all_playlists().values():
+            playlist.clock = clock
+
     def initialize(self, all_processors):
         """Load all user playlists into memory."""
         if not self.user_playlists_dir or not os.path.isdir(self.user_playlists_dir):
@@ -264,8 +291,10 @@ class PlaylistManager:
         playlist_name = playlist_name.lower()
         if playlist_name == self.PLAYLIST_NAME_DEFAULT:
             raise ValueError('cannot replace the default playlist')
-        elif not self.PLAYLIST_NAME_RE.match(playlist_name):
+        elif not self.PLAYLIST_NAME_RE.fullmatch(playlist_name):
             raise ValueError('Illegal playlist name: "{}"'.format(playlist_name))
+        if self.clock is not None:
+            playlist.clock = self.clock
         self.user_playlists[playlist_name] = playlist
         self.logger.info('Loaded playlist "{}"'.format(playlist_name))
 
@@ -4,7 +4,9 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import os
-from floor.controller.playlist import Playlist, PlaylistItem
+import shutil
+import tempfile
+from floor.controller.playlist import Playlist, PlaylistItem, PlaylistManager
 from floor.controller.playlist import ProcessorNotFound
 from floor.processor import all_processors
 from unittest import TestCase
@@ -16,6 +18,16 @@ DEFAULT_PLAYLIST = BASE_DIR + '/../../config/playlists/default.json'
 class PlaylistTest(TestCase):
     def setUp(self):
         self.all_procs = all_processors()
+        # Current time of the clock used by `new_timed_playlist()`.
+        self.now = 100.0
+
+    def new_timed_playlist(self):
+        """Returns a playlist of two 10s items, running on `self.now`."""
+        animator = self.all_procs['Animator']
+        return Playlist('Test', items=[
+            PlaylistItem(animator, title='first', duration=10),
+            PlaylistItem(animator, title='second', duration=10),
+        ], clock=lambda: self.now)
 
     def test_default_playlist(self):
         p = Playlist.from_file(DEFAULT_PLAYLIST, self.all_procs, strict=True)
@@ -54,3 +66,71 @@ class PlaylistTest(TestCase):
             PlaylistItem.from_object({
                 'name': 'ZoopZap',
             }, self.all_procs)
+
+    def test_save_and_load(self):
+        playlist = Playlist.from_file(DEFAULT_PLAYLIST, self.all_procs, strict=True)
+        output_dir = tempfile.mkdtemp()
+        try:
+            output_filename = os.path.join(output_dir, 'saved.json')
+            playlist.save_to(output_filename)
+            loaded = Playlist.from_file(output_filename, self.all_procs, strict=True)
+        finally:
+            shutil.rmtree(output_dir)
+
+        self.assertEqual(playlist.title, loaded.title)
+        self.assertEqual(
+            [i.to_object() for i in playlist.queue],
+            [i.to_object() for i in loaded.queue])
+
+    def test_get_current_advances_after_duration(self):
+        playlist = self.new_timed_playlist()
+        self.assertEqual('first', playlist.get_current().title)
+        self.assertEqual(110.0, playlist.next_advance)
+
+        self.assertEqual('first', playlist.get_current(now=109.0).title)
+        self.assertEqual('second', playlist.get_current(now=111.0).title)
+
+    def test_get_current_reads_clock(self):
+        playlist = self.new_timed_playlist()
+        self.assertEqual('first', playlist.get_current().title)
+
+        self.now = 111.0
+        self.assertEqual('second', playlist.get_current().title)
+
+    def test_stop_and_start_keep_remaining_duration(self):
+        playlist = self.new_timed_playlist()
+        playlist.get_current()
+
+        self.now = 104.0
+        playlist.stop_playlist()
+        self.assertEqual(6.0, playlist.queue[0].remaining_duration)
+        self.assertIsNone(playlist.next_advance)
+
+        self.now = 200.0
+        playlist.start_playlist()
+        self.assertEqual(206.0, playlist.next_advance)
+        self.assertEqual('first', playlist.get_current().title)
+
+
+class PlaylistManagerTest(TestCase):
+    def test_add_playlist_names(self):
+        manager = PlaylistManager(Playlist('Default'))
+        playlist = Playlist('Mine')
+
+        manager.add_playlist('My Playlist_2', playlist)
+        self.assertIs(playlist, manager.get_playlist('my playlist_2'))
+
+        for bad_name in ('default', 'bad/name', '../name', 'name!', ''):
+            with self.assertRaises(ValueError):
+                manager.add_playlist(bad_name, playlist)
+
+    def test_set_clock(self):
+        clock = lambda: 5.0
+        default = Playlist('Default')
+        manager = PlaylistManager(default)
+        manager.add_playlist('before', Playlist('Before'))
+
+        manager.set_clock(clock)
+        manager.add_playlist('after', Playlist('After'))
+        for playlist in manager.get_all_playlists().values():
+            self.assertIs(clock, playlist.clock)
@@ -7,6 +7,8 @@ from builtins import str
 from builtins import object
 import logging
 
+import numpy as np
+
 from floor.processor.constants import RANGED_INPUT_MAX
 
 
@@ -19,6 +21,8 @@ class BaseRenderLayer(object):
         self.alpha = 1.0
         self.ranged_values = [0] * 4
         self.switches = [False] * 4
+        # Frame buffer handed to this layer's processor as `RenderContext.out_buffer`.
+        self.out_buffer = np.zeros((64, 3), dtype=np.float32)
 
     def set_enabled(self, enabled):
         self.enabled = bool(enabled)
@@ -38,12 +42,17 @@ class BaseRenderLayer(object):
         Arguments:
             num {integer} -- The 0-indexed fader/slider number, between 0-3 inclusive
             val {integer} -- The position value, between 0-`RANGED_INPUT_MAX` inclusive
+
+        Returns:
+            Whether `num` was in range and the value was set.
         """
+        if num < 0 or num >= len(self.ranged_values):
+            self.logger.warning('Ignoring ranged value %d, not in [0, %d)', num, len(self.ranged_values))
+            return False
         val = max(0, min(val, RANGED_INPUT_MAX))
-        self.logger.debug('on_ranged_value_change: {} -> {}'.format(num, val))
-        if num >= len(self.ranged_values):
-            return
+        self.logger.debug('on_ranged_value_change: %d -> %s', num, val)
         self.ranged_values[num] = val
+        return True
 
     def on_switch_change(self, num, is_on):
         """Sets the on/off switch value.
@@ -51,12 +60,17 @@ class BaseRenderLayer(object):
         Arguments:
             num {integer} -- The 0-indexed switch number, between 0-3 inclusive
             is_on {bool} -- Whether the switch should be on or off
+
+        Returns:
+            Whether `num` was in range and the value was set.
         """
+        if num < 0 or num >= len(self.switches):
+            self.logger.warning('Ignoring switch %d, not in [0, %d)', num, len(self.switches))
+            return False
         is_on = bool(is_on)
-        self.logger.debug('on_switch_change: {} -> {}'.format(num, is_on))
-        if num >= len(self.switches):
-            return
-        self.switches[num] = bool(is_on)
+        self.logger.debug('on_switch_change: %d -> %s', num, is_on)
+        self.switches[num] = is_on
+        return True
 
     def render(self, render_context):
         """Return a frame of pixels
@@ -81,9 +95,10 @@ class ProcessorRenderLayer(BaseRenderLayer):
 
     def on_ranged_value_change(self, num, val):
         """Extends the base implementation to add a callback to the current processor."""
-        super(ProcessorRenderLayer, self).on_ranged_value_change(num, val)
-        if self.processor:
+        accepted = super(ProcessorRenderLayer, self).on_ranged_value_change(num, val)
+        if accepted and self.processor:
             self.processor.on_ranged_value_change(num, val)
+        return accepted
 
     def render(self, render_context):
         if self.processor:
@@ -148,7 +163,7 @@ class PlaylistRenderLayer(BaseRenderLayer):
             return None
 
     def _check_playlist(self, playlist, render_context):
-        item = playlist.get_current()
+        item = playlist.get_current(now=render_context.clock)
         if not item:
             return
 
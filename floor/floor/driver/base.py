@@ -1,6 +1,7 @@
-from builtins import range
 from builtins import object
 
+import numpy as np
+
 from floor.controller import Layout
 
 
@@ -8,7 +9,7 @@ class Base(object):
 
     def __init__(self, driver_args):
         self.weights = []
-        self.leds = [[0, 0, 0, 0] for _ in range(64)]
+        self.leds = np.zeros((64, 3), dtype=np.float32)
         self.args = driver_args
         self.layout = None
 
@@ -34,8 +35,10 @@ class Base(object):
 
     def set_leds(self, values):
         """
-        Set a list of LED objects representing the next set of color values
-        :param values:
+        Set the next set of color values
+        :param values: a (64, 3) ndarray of (r, g, b) values on [0, COLOR_MAXIMUM].
+            The controller reuses this array for every frame, so it is only valid
+            until the next frame is generated; copy it to keep it past `send_data()`.
         :return:
         """
         self.leds = values
@@ -60,3 +63,11 @@ class Base(object):
         :return:
         """
         pass
+
+    def warm_up(self):
+        """
+        Overridden by driver; does slow one-time setup, such as compiling jitted
+        helpers, before the first frame is sent
+        :return:
+        """
+        pass
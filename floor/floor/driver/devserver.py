@@ -1,4 +1,3 @@
-from builtins import map
 from gevent import monkey
 monkey.patch_all()
 
@@ -11,6 +10,7 @@ import time
 logger = logging.getLogger('devserver')
 
 import gevent
+import numpy as np
 from geventwebsocket.handler import WebSocketHandler
 
 from flask import Flask
@@ -103,7 +103,7 @@ class Devserver(Base):
         return (color_value / float(COLOR_MAXIMUM)) * 256.0
 
     def send_data(self):
-        leds = [list(map(self.rescale_color_value, pixel)) for pixel in self.leds]
+        leds = self.rescale_color_value(np.asarray(self.leds, dtype=np.float32)).tolist()
         message = {
             "event": "leds",
             "payload": leds,
@@ -4,12 +4,39 @@ import importlib
 import logging
 import time
 
+import numpy as np
+
 from .base import Base
+from floor.processor.constants import COLOR_MAXIMUM
+from floor.util.jit import njit
 from floor.util.serial_read import SerialRead
 
 logger = logging.getLogger('raspberry')
 
 
+@njit(cache=True, boundscheck=False)
+def pack_frame(leds, order, cmax, out):
+    """Clamps and packs the pixels of `leds` into `out` in the floor's wire format.
+
+    Pixels are written in the sequence given by the tile indexes in `order`. Each
+    pixel's three 10-bit values, clamped to `[0, cmax]`, are repacked into 4 bytes.
+    """
+    for n in range(order.shape[0]):
+        pixel = order[n]
+        r = leds[pixel, 0]
+        r = 0 if r < 0 else (cmax if r > cmax else int(r))
+        g = leds[pixel, 1]
+        g = 0 if g < 0 else (cmax if g > cmax else int(g))
+        b = leds[pixel, 2]
+        b = 0 if b < 0 else (cmax if b > cmax else int(b))
+
+        out[n * 4] = r >> 4
+        out[n * 4 + 1] = ((r & 0x00F) << 4) | (g >> 6)
+        out[n * 4 + 2] = ((g & 0x3F) << 2) | ((b & 0x300) >> 8)
+        out[n * 4 + 3] = b & 0x0FF
+    return out
+
+
 class Raspberry(Base):
     # Unique bytes to send through the floor when probing.  Can tell whether the
     # data we get back is what we sent vs. random existing data
@@ -73,6 +100,12 @@ class Raspberry(Base):
 
         self.reader = SerialRead()
 
+        # Tiles to send data for, in output order, and the buffer they're packed into.
+        # Both are rebuilt if the layout changes.
+        self.send_order = None
+        self.send_order_layout = None
+        self.send_buffer = None
+
     def probe_floor(self):
         """
         Send data into the floor with a unique value in the first byte and a counter
@@ -123,23 +156,35 @@ class Raspberry(Base):
         num_squares = (self.WEIGHT_PACKETS - 1) - value
         return num_squares
 
+    def update_send_order(self):
+        """Recomputes `send_order` and `send_buffer` for the current layout."""
+        # Don't send data for tiles that have been bypassed
+        order = [led for led in self.TILE_ORDER if not (self.layout and self.layout.is_bypassed(led))]
+        self.send_order = np.array(order, dtype=np.intp)
+        self.send_buffer = np.zeros(len(order) * 4, dtype=np.uint8)
+        self.send_order_layout = self.layout
+
+    def warm_up(self):
+        """
+        Compiles `pack_frame` for the frames the controller sends: its uint16
+        frame buffer, and float64 once brightness is scaled down
+        :return:
+        """
+        order = np.arange(64, dtype=np.intp)
+        out = np.zeros(len(order) * 4, dtype=np.uint8)
+        for dtype in (np.uint16, np.float64):
+            pack_frame(np.zeros((64, 3), dtype=dtype), order, COLOR_MAXIMUM, out)
+
     def send_data(self):
         """
         :return:
         """
-        data = list()
-        for led in self.TILE_ORDER:
-            # Don't add this data to the list if this tile has been bypassed
-            if self.layout and self.layout.is_bypassed(led):
-                continue
-
-            rgb = self.leds[led]
-
-            # Repack 3 10-bit values into 4 8-bit values
-            data.append(int(rgb[0]) >> 4)
-            data.append(((int(rgb[0]) & 0x00F) << 4) | (int(rgb[1]) >> 6))
-            data.append(((int(rgb[1]) & 0x3F) << 2) | ((int(rgb[2]) & 0x300) >> 8))
-            data.append(int(rgb[2]) & 0x0FF)
+        if self.send_order is None or self.send_order_layout is not self.layout:
+            self.update_send_order()
+
+        # Repack 3 10-bit values into 4 8-bit values
+        pack_frame(np.asarray(self.leds), self.send_order, COLOR_MAXIMUM, self.send_buffer)
+        data = self.send_buffer.tolist()
 
         """ DEBUGGING
         byte = 0
@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from unittest import TestCase, skipUnless
+import numpy as np
+
+from floor.driver.raspberry import Raspberry, pack_frame
+from floor.processor.constants import COLOR_MAXIMUM
+from floor.util.jit import HAVE_NUMBA
+
+
+class PackFrameTest(TestCase):
+    def test_pack_frame(self):
+        leds = np.array([
+            (0x3ff, 0x000, 0x3ff),
+            (0x123, 0x2ab, 0x1cd),
+            (-5, 2000, 1.9),
+        ], dtype=np.float32)
+        out = np.zeros(12, dtype=np.uint8)
+
+        pack_frame(leds, np.array([1, 0, 2]), COLOR_MAXIMUM, out)
+        self.assertEqual([
+            # 0x123, 0x2ab, 0x1cd
+            0x12, 0x3a, 0xad, 0xcd,
+            # 0x3ff, 0x000, 0x3ff
+            0x3f, 0xf0, 0x03, 0xff,
+            # Clamped and truncated to 0x000, 0x3ff, 0x001
+            0x00, 0x0f, 0xfc, 0x01,
+        ], out.tolist())
+
+    @skipUnless(HAVE_NUMBA, 'numba is not installed')
+    def test_warm_up_compiles_frame_types(self):
+        # warm_up() doesn't need the SPI device that __init__ opens.
+        Raspberry.__new__(Raspberry).warm_up()
+        leds_dtypes = set(str(signature[0].dtype) for signature in pack_frame.signatures)
+        self.assertTrue({'uint16', 'float64'} <= leds_dtypes, leds_dtypes)
@@ -10,6 +10,9 @@ from collections import OrderedDict
 from .base import ProcessorRegistry
 from .base import Base
 
+# Sorted snapshot of the registry, rebuilt only when a processor is added.
+_all_processors = None
+
 
 def _import_all():
     """Import all processors, to trigger registration."""
@@ -20,9 +23,19 @@ def _import_all():
 
 
 def all_processors():
-    """Returns a dict of processor name -> processor class"""
-    _import_all()
-    return OrderedDict(sorted(ProcessorRegistry.ALL_PROCESSORS.items()))
+    """Returns a dict of processor name -> processor class
+
+    The result is shared between callers and must not be modified.
+    """
+    global _all_processors
+    if _all_processors is None:
+        _import_all()
+    registry = ProcessorRegistry.ALL_PROCESSORS
+    if _all_processors is None or len(_all_processors) != len(registry):
+        # Processors declared outside this package (e.g. in tests) register
+        # late; the registry only ever grows, so its size detects that.
+        _all_processors = OrderedDict(sorted(registry.items()))
+    return _all_processors
 
 
 __all__ = ['all_processors']
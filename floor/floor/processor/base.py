@@ -9,6 +9,8 @@ import logging
 import colorsys
 import sys
 
+import numpy as np
+
 from floor.processor.constants import COLOR_MAXIMUM, RANGED_INPUT_MAX
 from future.utils import with_metaclass
 
@@ -36,6 +38,10 @@ class RenderContext(object):
 
     This class is how the `Controller` passes state to the `Processor`. As such,
     it can be considered write-only for the Controller, and read-only for the Processor.
+
+    The one exception is `out_buffer`, a `(64, 3)` float32 ndarray that a processor
+    may fill in place with its frame and return, instead of building a new list of
+    pixels. The buffer is reused across frames, so every pixel must be written.
     """
     class RangedInput:
         """Simple enum for logical `ranged_values` names."""
@@ -44,13 +50,16 @@ class RenderContext(object):
         AUX1 = 2
         AUX2 = 3
 
-    def __init__(self, clock, downbeat, weights, bpm, ranged_values, switches):
+    def __init__(self, clock, downbeat, weights, bpm, ranged_values, switches, out_buffer=None):
         self.clock = clock
         self.downbeat = downbeat
         self.weights = weights
         self.bpm = bpm
         self.ranged_values = ranged_values
         self.switches = switches
+        if out_buffer is None:
+            out_buffer = np.zeros((64, 3), dtype=np.float32)
+        self.out_buffer = out_buffer
 
     @classmethod
     def ranged_selection(cls, ranged_value, choices):
@@ -161,10 +170,19 @@ class Base(with_metaclass(ProcessorRegistry, object)):
         (x, y) = pixel
         return (x * self.FLOOR_WIDTH) + y
 
+    @classmethod
+    def warm_up(cls):
+        """
+        Overridden by processors with slow one-time setup, such as compiling a
+        jitted kernel, so that it happens before the show rather than mid-show
+        """
+        pass
+
     def get_next_frame(self, context):
         """
         Generate the LED values needed for the next frame
-        :return:
+        :return: 64 (r, g, b) pixels, either as a list or as `context.out_buffer`
+        filled in place
         """
         pass
 
@@ -1,10 +1,15 @@
-from builtins import range
+import numpy as np
+
 from floor.processor.base import Base
 from floor.processor.utils import clocked
 from floor.processor.constants import COLOR_MAXIMUM
 
 
 class ColorWash(Base):
+    # x and y coordinates of each pixel index.
+    X = np.repeat(np.arange(8), 8)
+    Y = np.tile(np.arange(8), 8)
+
     def __init__(self, **kwargs):
         super(ColorWash, self).__init__(**kwargs)
         self.red = 0
@@ -13,15 +18,10 @@ class ColorWash(Base):
 
     @clocked(frames_per_second=24)
     def get_next_frame(self, context):
-        pixels = []
-
-        for x in range(0, 8):
-            for y in range(0, 8):
-                pixels.append((
-                    (self.red * x) % COLOR_MAXIMUM,
-                    (self.green * y) % COLOR_MAXIMUM,
-                    self.blue % COLOR_MAXIMUM
-                ))
+        pixels = context.out_buffer
+        pixels[:, 0] = (self.red * self.X) % COLOR_MAXIMUM
+        pixels[:, 1] = (self.green * self.Y) % COLOR_MAXIMUM
+        pixels[:, 2] = self.blue % COLOR_MAXIMUM
 
         self.red += 1
         self.green += 1
@@ -11,6 +11,7 @@ from unittest import TestCase
 
 from floor import processor
 from floor.processor.base import Base as BaseProcessor
+from floor.processor.base import ProcessorRegistry
 from floor.processor.base import RenderContext
 
 
@@ -52,4 +53,18 @@ def test_run_all_processors():
 class ProcessorTest(TestCase):
     def test_all_processors_excludes_base(self):
         processors = processor.all_processors()
-        self.assert_(BaseProcessor not in list(processors.values()))
\ No newline at end of file
+        self.assert_(BaseProcessor not in list(processors.values()))
+
+    def test_all_processors_is_cached(self):
+        processors = processor.all_processors()
+        self.assertIs(processors, processor.all_processors())
+
+        class LateProcessor(BaseProcessor):
+            pass
+
+        try:
+            processors = processor.all_processors()
+            self.assertIs(LateProcessor, processors['LateProcessor'])
+            self.assertEqual(sorted(processors.keys()), list(processors.keys()))
+        finally:
+            del ProcessorRegistry.ALL_PROCESSORS['LateProcessor']
\ No newline at end of file
@@ -1,12 +1,40 @@
 from builtins import range
 import math
 
+import numpy as np
+
 from floor.processor.base import Base
 from floor.processor.utils import clocked
-from floor.util import color_utils
+from floor.util.color_utils_nb import clamp, cos, remap
+from floor.util.jit import njit
 from floor.processor.constants import COLOR_MAXIMUM
 
 
+@njit(cache=True, fastmath=True)
+def raver_plaid_frame(t, freq_r, freq_g, freq_b, speed_r, speed_g, speed_b, out):
+    """Fills `out` with one frame of plaid at time `t`."""
+    n_pixels = out.shape[0]
+    blackstripes_offset = cos(t, offset=0.9, period=60, minn=-0.5, maxx=3)
+    for ii in range(n_pixels):
+        pct = 1.0 * ii / n_pixels
+
+        # diagonal black stripes
+        pct_jittered = (pct * 77) % 37
+        blackstripes = cos(pct_jittered, offset=t * 0.05, period=1, minn=-1.5, maxx=1.5)
+        blackstripes = clamp(blackstripes + blackstripes_offset, 0, 1)
+
+        # 3 sine waves for r, g, b which are out of sync with each other
+        out[ii, 0] = blackstripes * remap(
+            math.cos((t / speed_r + pct * freq_r) * math.pi * 2), -1, 1, 0, COLOR_MAXIMUM)
+
+        out[ii, 1] = blackstripes * remap(
+            math.cos((t / speed_g + pct * freq_g) * math.pi * 2), -1, 1, 0, COLOR_MAXIMUM)
+
+        out[ii, 2] = blackstripes * remap(
+            math.cos((t / speed_b + pct * freq_b) * math.pi * 2), -1, 1, 0, COLOR_MAXIMUM)
+    return out
+
+
 class RaverPlaid(Base):
 
     def __init__(self, **kwargs):
@@ -27,32 +55,23 @@ class RaverPlaid(Base):
 
         self.start_time = None
 
+    @classmethod
+    def warm_up(cls):
+        plaid = cls()
+        raver_plaid_frame(
+            0.0,
+            plaid.freq_r, plaid.freq_g, plaid.freq_b,
+            plaid.speed_r, plaid.speed_g, plaid.speed_b,
+            np.zeros((plaid.n_pixels, 3), dtype=np.float32))
+
     @clocked(frames_per_second=24)
     def get_next_frame(self, context):
         if self.start_time is None:
             self.start_time = context.clock
 
         t = (context.clock - self.start_time) * 5
-        pixels = []
-        for ii in range(self.n_pixels):
-            pct = 1.0 * ii / self.n_pixels
-
-            # diagonal black stripes
-            pct_jittered = (pct * 77) % 37
-            blackstripes = color_utils.cos(pct_jittered, offset=t * 0.05, period=1, minn=-1.5, maxx=1.5)
-            blackstripes_offset = color_utils.cos(t, offset=0.9, period=60, minn=-0.5, maxx=3)
-            blackstripes = color_utils.clamp(blackstripes + blackstripes_offset, 0, 1)
-
-            # 3 sine waves for r, g, b which are out of sync with each other
-            r = blackstripes * color_utils.remap(
-                math.cos((t / self.speed_r + pct * self.freq_r) * math.pi * 2), -1, 1, 0, COLOR_MAXIMUM)
-
-            g = blackstripes * color_utils.remap(
-                math.cos((t / self.speed_g + pct * self.freq_g) * math.pi * 2), -1, 1, 0, COLOR_MAXIMUM)
-
-            b = blackstripes * color_utils.remap(
-                math.cos((t / self.speed_b + pct * self.freq_b) * math.pi * 2), -1, 1, 0, COLOR_MAXIMUM)
-
-            pixels.append((r, g, b))
-
-        return pixels
+        return raver_plaid_frame(
+            t,
+            self.freq_r, self.freq_g, self.freq_b,
+            self.speed_r, self.speed_g, self.speed_b,
+            context.out_buffer[:self.n_pixels])
@@ -1,4 +1,5 @@
-from builtins import range
+import numpy as np
+
 from floor.processor.base import Base
 
 
@@ -26,11 +27,7 @@ class SimpleStep(Base):
         super(SimpleStep, self).__init__(**kwargs)
 
     def get_next_frame(self, context):
-        weights = context.weights
-        pixels = [(0, 0, 0)] * 64
-
-        for idx in range(64):
-            if weights[idx] > 0:
-                pixels[idx] = self.hsv_to_rgb([self.HUE, self.SAT, self.VAL])
-
+        pixels = context.out_buffer
+        pixels.fill(0)
+        pixels[np.asarray(context.weights) > 0] = self.hsv_to_rgb([self.HUE, self.SAT, self.VAL])
         return pixels
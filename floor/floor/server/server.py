@@ -25,7 +25,7 @@ def main():
 
 def view_playlist(playlist):
     if playlist.next_advance is not None:
-        remain = max(0, playlist.next_advance - time.time())
+        remain = max(0, playlist.next_advance - playlist.clock())
     else:
         remain = 0
     remain_millis = int(remain * 1000)
@@ -38,6 +38,8 @@ def view_playlist(playlist):
 
 
 def view_tempo(bpm, downbeat):
+    # The controller's clock isn't wall clock time; convert before reporting.
+    downbeat += time.time() - app.controller.clocksource.time()
     return {
         'bpm': bpm,
         'downbeat_millis': int(downbeat * 1000)
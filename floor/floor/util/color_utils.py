@@ -3,9 +3,11 @@ Helper functions to make color manipulations easier
 """
 
 from __future__ import division
-from builtins import range
+import functools
 import math
 import random
+import struct
+import numpy as np
 from floor.processor.constants import COLOR_MAXIMUM, WHITE, BLACK
 
 def remap(x, oldmin, oldmax, newmin, newmax):
@@ -97,7 +99,17 @@ def mod_dist(a, b, n):
     mod_dist(11, 1, 12) == 2 because you can "wrap around".
 
     """
-    return min((a-b) % n, (b-a) % n)
+    d = (a-b) % n
+    return d if d <= n*0.5 else n-d
+
+
+def mod_dist_arr(a, b, n):
+    """
+    Elementwise `mod_dist` for arrays a and b, for example the distance of
+    every cell on the floor from an origin.
+
+    """
+    return np.minimum(np.mod(a-b, n), np.mod(b-a, n))
 
 
 def gamma(color, gamma_val):
@@ -117,11 +129,8 @@ def scale_color(color, scale):
 
 
 def hex_to_rgb(value):
-    """Given an RGB hex value, returns a 3-tuple scaled to COLOR_MAXIMUM."""
-    value = value.lstrip('#')
-    lv = len(value)
-    hex_values = (value[i:i + lv // 3] for i in range(0, lv, lv // 3))
-    raw_color = tuple(int(v, 16) for v in hex_values)
+    """Given a 6-digit RGB hex value, returns a 3-tuple scaled to COLOR_MAXIMUM."""
+    raw_color = struct.unpack('BBB', bytes.fromhex(value.lstrip('#')))
     return scale_color(raw_color, COLOR_MAXIMUM / 255.0)
 
 # palettes as hex strings
@@ -139,15 +148,16 @@ palettes = {
 palette_keys = list(palettes.keys())
 palettes_length = len(palette_keys)
 
+# palettes converted to (r, g, b) tuples, computed once at import
+_palettes_rgb = dict((name, [hex_to_rgb(c) for c in hex_colors]) for name, hex_colors in palettes.items())
+
 
 def get_palette(name):
-    return [hex_to_rgb(c) for c in palettes[name]]
+    return list(_palettes_rgb[name])
 
 
 def get_random_palette():
-    idx = random.randint(0, palettes_length - 1)
-    name = palette_keys[idx]
-    return get_palette(name)
+    return get_palette(random.choice(palette_keys))
 
 
 def normalize_pixel(pixel):
@@ -197,8 +207,33 @@ def alpha_blend(pixel_above, pixel_below, alpha, black_is_transparent=True):
         rAbove, gAbove, bAbove = pixel_above[:3]
         rBelow, gBelow, bBelow = pixel_below[:3]
 
-        rOut = alpha * rAbove + (1 - alpha) * rBelow
-        gOut = alpha * gAbove + (1 - alpha) * gBelow
-        bOut = alpha * bAbove + (1 - alpha) * bBelow
+        inv_alpha = 1.0 - alpha
+        rOut = alpha * rAbove + inv_alpha * rBelow
+        gOut = alpha * gAbove + inv_alpha * gBelow
+        bOut = alpha * bAbove + inv_alpha * bBelow
 
         return normalize_pixel((rOut, gOut, bOut))[:3]
+
+
+# Gamma correction for whole frames of normalized integer pixels, as an
+# `(N, 3)` ndarray with one row per pixel, by table lookup rather than `pow()`.
+
+@functools.lru_cache(maxsize=16)
+def gamma_lut(gamma_val):
+    """Returns a lookup table mapping each value on [0, COLOR_MAXIMUM] through a gamma curve.
+
+    The table is shared between callers, so it is read-only.
+    """
+    values = np.arange(COLOR_MAXIMUM + 1) / float(COLOR_MAXIMUM)
+    lut = (values ** gamma_val * COLOR_MAXIMUM).astype(np.uint16)
+    lut.flags.writeable = False
+    return lut
+
+
+def gamma_normalized_frame(frame, gamma_val, out=None):
+    """Apply a gamma curve to a normalized frame, with integer values on [0, COLOR_MAXIMUM].
+
+    Equivalent to scaling `frame` to 0-1, applying `gamma` and scaling back, but
+    costs a single table lookup per channel. `out` may be `frame` itself.
+    """
+    return np.take(gamma_lut(gamma_val), frame, out=out, mode='clip')
@@ -0,0 +1,76 @@
+"""
+Jitted versions of the per-frame color helpers in `color_utils`.
+
+The scalar helpers (`clamp`, `remap`, `cos`) are meant to be called from other
+jitted code, such as a processor's frame kernel, where numba inlines them. From
+plain Python, the versions in `color_utils` are faster.
+"""
+
+import math
+import numpy as np
+from floor.util.jit import njit
+from floor.processor.constants import COLOR_MAXIMUM
+
+
+@njit(cache=True, inline='always', fastmath=True)
+def remap(x, oldmin, oldmax, newmin, newmax):
+    """See `color_utils.remap`."""
+    zero_to_one = (x-oldmin) / (oldmax-oldmin)
+    return zero_to_one*(newmax-newmin) + newmin
+
+
+@njit(cache=True, inline='always', fastmath=True)
+def clamp(x, minn, maxx):
+    """See `color_utils.clamp`."""
+    return minn if x < minn else (maxx if x > maxx else x)
+
+
+@njit(cache=True, inline='always', fastmath=True)
+def cos(x, offset=0, period=1, minn=0, maxx=1):
+    """See `color_utils.cos`."""
+    value = math.cos((x/period - offset) * math.pi * 2) / 2 + 0.5
+    return value*(maxx-minn) + minn
+
+
+@njit(cache=True)
+def _normalize(value, cmax):
+    if value < 0:
+        return 0
+    if value > cmax:
+        return cmax
+    return int(value)
+
+
+def alpha_to_fixed(alpha):
+    """Converts an alpha on [0.0, 1.0] to the integer form `blend_norm_u16` takes."""
+    return int(round(alpha * 256))
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def blend_norm_u16(above, below, alpha256, cmax, out):
+    """Normalizes `above` and blends it onto `below` with given alpha, into `out`.
+
+    `below` and `out` are integer frames, typically uint16, and `alpha256` is
+    the alpha in 1/256ths (see `alpha_to_fixed`), so the blend itself is pure
+    integer math. Otherwise equivalent to `alpha_blend` on each normalized
+    pixel, fused into a single pass. `out` may be the same array as `below`.
+    """
+    inv_alpha256 = 256 - alpha256
+    for i in range(above.shape[0]):
+        # A channel normalizes to 0 iff it is below 1; black pixels are
+        # treated as fully transparent.
+        if above[i, 0] < 1 and above[i, 1] < 1 and above[i, 2] < 1:
+            for c in range(3):
+                out[i, c] = below[i, c]
+            continue
+        for c in range(3):
+            value = _normalize(above[i, c], cmax) * alpha256 + int(below[i, c]) * inv_alpha256
+            out[i, c] = value >> 8
+    return out
+
+
+def warm_up():
+    """Compile the jitted helpers now, rather than on the first frame."""
+    above = np.zeros((64, 3), dtype=np.float32)
+    below = np.zeros((64, 3), dtype=np.uint16)
+    blend_norm_u16(above, below, 256, COLOR_MAXIMUM, below)
@@ -4,7 +4,9 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from unittest import TestCase
+import numpy as np
 from . import color_utils
+from . import color_utils_nb
 from floor.processor.constants import BLACK, WHITE, COLOR_MAXIMUM
 
 
@@ -55,7 +57,52 @@ class ColorUtilsTests(TestCase):
         self.assertEqual(WHITE, color_utils.hex_to_rgb('#ffffff'))
         self.assertEqual(BLACK, color_utils.hex_to_rgb('#000000'))
         self.assertEqual((0, COLOR_MAXIMUM, 0), color_utils.hex_to_rgb('#00ff00'))
+        self.assertEqual(color_utils.hex_to_rgb('#9400d3'), color_utils.hex_to_rgb('9400D3'))
 
     def test_get_pallet(self):
         for p in color_utils.palettes.keys():
-            color_utils.get_palette(p)
+            palette = color_utils.get_palette(p)
+            self.assertEqual([color_utils.hex_to_rgb(c) for c in color_utils.palettes[p]], palette)
+
+        # Callers get their own copy of the cached palette.
+        color_utils.get_palette('rygw').append(BLACK)
+        self.assertEqual(4, len(color_utils.get_palette('rygw')))
+
+    def test_blend_norm_u16_matches_alpha_blend(self):
+        above = np.array([(255, 255, 255), (2000, -3, 0.5), (0, 0, 1), (0.5, 0, 0)], dtype=np.float32)
+        below = np.array([(0, 0, 0), (10, 20, 1023), (1, 2, 3), (1, 2, 3)], dtype=np.uint16)
+
+        # These alphas are exact in 1/256ths, so results should match exactly.
+        for alpha in (0.0, 0.25, 0.5, 1.0):
+            out = np.empty_like(below)
+            color_utils_nb.blend_norm_u16(above, below, color_utils_nb.alpha_to_fixed(alpha), COLOR_MAXIMUM, out)
+            for idx in range(len(above)):
+                pixel_above = color_utils.normalize_pixel(tuple(above[idx]))[:3]
+                pixel_below = tuple(int(v) for v in below[idx])
+                expected = color_utils.normalize_pixel(
+                    color_utils.alpha_blend(pixel_above, pixel_below, alpha))[:3]
+                self.assertEqual(list(expected), out[idx].tolist())
+
+    def test_mod_dist(self):
+        self.assertEqual(2, color_utils.mod_dist(11, 1, 12))
+        self.assertEqual(2, color_utils.mod_dist(1, 11, 12))
+        self.assertEqual(0, color_utils.mod_dist(3, 15, 12))
+        self.assertEqual(6, color_utils.mod_dist(0, 6, 12))
+        self.assertAlmostEqual(0.2, color_utils.mod_dist(0.1, 0.9, 1))
+
+        a = np.arange(-12, 24)
+        self.assertEqual(
+            [color_utils.mod_dist(x, 1, 12) for x in a],
+            color_utils.mod_dist_arr(a, 1, 12).tolist())
+
+    def test_gamma_normalized_frame(self):
+        frame = np.array([(0, 1, 2), (100, 511, 512), (1000, 1022, COLOR_MAXIMUM)], dtype=np.uint16)
+        for gamma_val in (0.5, 1.0, 2.2):
+            expected = [
+                [int(v * COLOR_MAXIMUM) for v in color_utils.gamma(pixel / float(COLOR_MAXIMUM), gamma_val)]
+                for pixel in frame]
+            self.assertEqual(expected, color_utils.gamma_normalized_frame(frame, gamma_val).tolist())
+
+        # The cached table is shared, so it must not be writable.
+        with self.assertRaises(ValueError):
+            color_utils.gamma_lut(2.2)[0] = 1
@@ -0,0 +1,20 @@
+"""
+Optional numba support.
+
+`njit` is numba's decorator when numba is installed. Otherwise it is a no-op
+decorator, so jitted helpers still run (slower) as plain Python.
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+        return decorator
@@ -5,5 +5,5 @@ setup(
     version='0.2.0',
     description='Dance floor',
     packages=find_packages(),
-    test_suite='nose.collector', install_requires=['gevent']
+    test_suite='nose.collector', install_requires=['gevent', 'numpy']
 )